@@ -1,31 +1,189 @@
+import functools
 import json
 import logging
 import os
+import queue
 import shutil
 import sys
-import time
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 import click
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.traceback import install
+import orjson
 
 from tpi_redes.config import (
     CHUNK_SIZE,
-    DEFAULT_SAVE_DIR,
     DEFAULT_HOST,
     DEFAULT_PROXY_PORT,
+    DEFAULT_SAVE_DIR,
     DEFAULT_SERVER_PORT,
 )
 
-console = Console(stderr=True)
+if TYPE_CHECKING:
+    from rich.console import Console
+
 logger = logging.getLogger("tpi-redes")
 
 
+@functools.cache
+def _console() -> "Console":
+    """Build the stderr console on first use.
+
+    rich is only needed by user-facing commands; importing it lazily keeps
+    it off the startup path of the pkexec'd sniffer-service child.
+    """
+    from rich.console import Console
+
+    return Console(stderr=True)
+
+
 debug_mode = False
 
+# Forwarded sniffer output goes through one buffered binary writer instead
+# of a print+flush (i.e. a write syscall) per captured packet line. The
+# reader threads only move bytes off their pipes and enqueue them; a single
+# writer thread does the stdout writes, so transient Electron-side
+# back-pressure on stdout does not stall packet capture. The queue is
+# bounded: if the frontend stops draining stdout for good, the readers
+# block on put and the pressure propagates up the sniffer pipe instead of
+# growing the queue without limit. The writer flushes whenever the queue
+# drains, which batches bursts and keeps idle tails prompt; control
+# events flush explicitly so the frontend sees them immediately.
+#
+# Everything that reaches _out must be newline-terminated: other writers
+# in this process (TRANSFER_UPDATE lines, PacketLogger flushes) hit fd 1
+# between our flushes, so a partial line left in the pipe would get
+# another event spliced into the middle of it and corrupt the JSON-lines
+# stream the frontend parses. Forwarders therefore carry partial lines
+# until the closing newline arrives, and control events share _out_lock
+# with the writer thread so they land between lines, never inside one.
+_STDOUT_BUFFER_SIZE = 64 * 1024
+_FORWARD_BUFFER_SIZE = 64 * 1024
+
+
+def _open_stdout() -> BinaryIO:
+    """Open the module-lifetime buffered writer on the stdout fd.
+
+    Falls back to fd 1 when sys.stdout has no usable fd (pytest capture
+    swaps in a pseudo-file), mirroring the packet logger's fallback. The
+    handle lives until process exit, so it is deliberately not a context
+    manager.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = 1
+    return open(fd, "wb", buffering=_STDOUT_BUFFER_SIZE, closefd=False)
+
+
+_out = _open_stdout()
+_unbuffered = False
+# 256 chunks of up to 64 KiB bounds queued output at 16 MiB.
+_writer_q: queue.Queue[bytes] = queue.Queue(maxsize=256)
+_writer_started = False
+_writer_lock = threading.Lock()
+_out_lock = threading.Lock()
+_forward_carry = b""
+
+
+def _start_writer():
+    """Start the background thread that drains the forward queue to stdout."""
+    global _writer_started
+    with _writer_lock:
+        if _writer_started:
+            return
+        _writer_started = True
+
+    def _write_loop():
+        while True:
+            data = _writer_q.get()
+            try:
+                with _out_lock:
+                    _out.write(data)
+                    if _unbuffered:
+                        _out.flush()
+                        continue
+                    # Keep writing while more chunks are pending, then
+                    # flush the whole batch with one syscall.
+                    while True:
+                        try:
+                            _out.write(_writer_q.get_nowait())
+                        except queue.Empty:
+                            break
+                    _out.flush()
+            except ValueError:
+                return
+
+    threading.Thread(target=_write_loop, daemon=True).start()
+
+
+def _forward_bytes(data: Any):
+    """Forward a raw chunk of sniffer output to buffered stdout.
+
+    Only the newline-terminated span of the chunk is queued; the tail of
+    a line cut by the pipe read is carried into the next chunk so a
+    writer flush can never end mid-line. A final unterminated fragment
+    (sniffer killed mid-write) is dropped — it was never a parseable
+    event.
+    """
+    global _forward_carry
+    chunk = _forward_carry + bytes(data)
+    cut = chunk.rfind(b"\n") + 1
+    _forward_carry = chunk[cut:]
+    if cut:
+        _writer_q.put(chunk[:cut])
+
+
+def _emit_control(event: dict[str, Any]):
+    """Emit a control event (SERVER_READY, SNIFFER_ERROR, ...) immediately.
+
+    Control events are rare and latency-sensitive, so they bypass the
+    flush interval and push any buffered packet lines out with them.
+    """
+    _emit_control_bytes(orjson.dumps(event) + b"\n")
+
+
+def _emit_control_bytes(payload: bytes):
+    """Write a pre-serialized control event line and flush immediately.
+
+    Shares _out_lock with the writer thread so the line lands on a line
+    boundary of the forwarded stream, never inside a packet line.
+    """
+    with _out_lock:
+        _out.write(payload)
+        _out.flush()
+
+
+# Fixed control envelopes, serialized once at import; the encoder never
+# runs for these on the (latency-sensitive) failure paths.
+_SNIFFER_TIMEOUT_EVENT = (
+    orjson.dumps(
+        {
+            "type": "SNIFFER_ERROR",
+            "code": "TIMEOUT",
+            "message": "Sniffer startup timed out.",
+        }
+    )
+    + b"\n"
+)
+_SNIFFER_CANCELLED_EVENT = (
+    orjson.dumps(
+        {
+            "type": "SNIFFER_ERROR",
+            "code": "PERMISSION_DENIED",
+            "message": "Sniffer authentication cancelled.",
+        }
+    )
+    + b"\n"
+)
+
+
+# Resolved once at import: every sniffer spawn reuses these instead of
+# re-walking the filesystem with abspath/join per invocation.
+_CLI_DIR = os.path.dirname(os.path.abspath(__file__))
+_SRC_PATH = os.path.abspath(os.path.join(_CLI_DIR, "../.."))
+
 
 def _is_frozen_binary() -> bool:
     """Return whether the backend is running as a bundled executable."""
@@ -43,12 +201,10 @@ def _build_sniffer_command(port: int, interface: str | None) -> list[str]:
             str(port),
         ]
     else:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        src_path = os.path.abspath(os.path.join(current_dir, "../.."))
         cmd = [
             "pkexec",
             "env",
-            f"PYTHONPATH={src_path}",
+            f"PYTHONPATH={_SRC_PATH}",
             sys.executable,
             "-m",
             "tpi_redes.cli.main",
@@ -65,15 +221,12 @@ def _build_sniffer_command(port: int, interface: str | None) -> list[str]:
 
 def _emit_sniffer_error(code: str, message: str) -> None:
     """Emit structured sniffer error for Electron IPC consumers."""
-    print(
-        json.dumps(
-            {
-                "type": "SNIFFER_ERROR",
-                "code": code,
-                "message": message,
-            }
-        ),
-        flush=True,
+    _emit_control(
+        {
+            "type": "SNIFFER_ERROR",
+            "code": code,
+            "message": message,
+        }
     )
 
 
@@ -84,42 +237,57 @@ def handle_exception(exc_type: Any, exc_value: Any, exc_traceback: Any):
         return
 
     if debug_mode:
-        console.print_exception(show_locals=True)
+        _console().print_exception(show_locals=True)
         sys.exit(1)
 
     sys.exit(1)
 
-    console.print(f"[bold red]Error:[/bold red] {exc_value}")
+    _console().print(f"[bold red]Error:[/bold red] {exc_value}")
 
     sys.exit(1)
 
 
-install(show_locals=True)
-
 sys.excepthook = handle_exception
 
 
 @click.group()
 @click.option("--debug", is_flag=True, help="Enable debug mode (tracebacks).")
-def cli(debug: bool):
+@click.option(
+    "--unbuffered",
+    is_flag=True,
+    help="Flush every forwarded sniffer line immediately (for debugging).",
+)
+@click.pass_context
+def cli(ctx: click.Context, debug: bool, unbuffered: bool):
     """File Transfer App CLI.
 
     Primary entry point for the backend services. Supports running
     Servers, Clients, Proxy, and Discovery services.
     Designed to interact with an Electron frontend via stdout JSON events.
     """
-    global debug_mode
+    global debug_mode, _unbuffered
+    if unbuffered:
+        _unbuffered = True
     if debug:
         debug_mode = True
+        from rich.traceback import install
+
         install(show_locals=True)
         logging.basicConfig(level=logging.DEBUG)
         logger.setLevel(logging.DEBUG)
+    elif ctx.invoked_subcommand == "sniffer-service":
+        # The privileged sniffer child writes JSON to a pipe; skip the
+        # rich handler setup entirely to keep its spawn latency down.
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        logger.setLevel(logging.INFO)
     else:
+        from rich.logging import RichHandler
+
         logging.basicConfig(
             level=logging.INFO,
             format="%(message)s",
             datefmt="[%X]",
-            handlers=[RichHandler(console=console)],
+            handlers=[RichHandler(console=_console())],
         )
         logger.setLevel(logging.INFO)
 
@@ -168,19 +336,17 @@ def start_server(
     discovery = None
 
     import subprocess
-    import threading
 
     try:
         save_dir = str(Path(save_dir).expanduser().resolve())
 
-        if sniff:
-            if shutil.which("pkexec") is None:
-                logger.error("pkexec command not found; sniffer disabled.")
-                _emit_sniffer_error(
-                    "MISSING_PKEXEC",
-                    "pkexec command not found on system.",
-                )
-                sniff = False
+        if sniff and shutil.which("pkexec") is None:
+            logger.error("pkexec command not found; sniffer disabled.")
+            _emit_sniffer_error(
+                "MISSING_PKEXEC",
+                "pkexec command not found on system.",
+            )
+            sniff = False
 
         if sniff:
             cmd = _build_sniffer_command(port=port, interface=interface)
@@ -188,69 +354,63 @@ def start_server(
             logger.info("Requesting root privileges for Sniffer...")
 
             try:
-                sniffer_process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, text=True, bufsize=1
-                )
+                sniffer_process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
 
                 sniffer_ready_event = threading.Event()
+                sniffer_exit_event = threading.Event()
 
                 def forward_sniffer_output():
                     try:
                         if not sniffer_process or not sniffer_process.stdout:
                             return
-                        for line in sniffer_process.stdout:
-                            if line.strip():
+                        _start_writer()
+                        # Sniffer JSON lines pass through untouched, so read
+                        # whole pipe-sized chunks into one reusable buffer
+                        # rather than splitting (and re-encoding) per line.
+                        fd = sniffer_process.stdout.fileno()
+                        buf = bytearray(_FORWARD_BUFFER_SIZE)
+                        view = memoryview(buf)
+                        while (n := os.readv(fd, [view])) > 0:
+                            if (
+                                not sniffer_ready_event.is_set()
+                                and bytes(view[:n]).strip()
+                            ):
                                 sniffer_ready_event.set()
-                            print(line, end="", flush=True)
+                            _forward_bytes(view[:n])
                     except Exception as e:
                         logger.error(f"Sniffer output forwarding failed: {e}")
+                    finally:
+                        # EOF means the sniffer died; wake the startup
+                        # waiter instead of letting it run out its timeout.
+                        sniffer_exit_event.set()
+                        sniffer_ready_event.set()
 
                 t = threading.Thread(target=forward_sniffer_output, daemon=True)
                 t.start()
-                wait_start = time.time()
-                while not sniffer_ready_event.is_set():
-                    if time.time() - wait_start > 30:
-                        logger.error("Sniffer startup timed out.")
-                        print(
-                            json.dumps(
-                                {
-                                    "type": "SNIFFER_ERROR",
-                                    "code": "TIMEOUT",
-                                    "message": "Sniffer startup timed out.",
-                                }
-                            ),
-                            flush=True,
-                        )
-                        break
-
-                    if sniffer_process.poll() is not None:
-                        exit_code = sniffer_process.poll()
-                        logger.warning(f"Sniffer process exited. Code: {exit_code}")
-                        print(
-                            json.dumps(
-                                {
-                                    "type": "SNIFFER_ERROR",
-                                    "code": "PERMISSION_DENIED",
-                                    "message": f"Sniffer died (Code {exit_code}).",
-                                }
-                            ),
-                            flush=True,
-                        )
-                        break
-
-                    time.sleep(0.1)
+                sniffer_ready_event.wait(timeout=30)
 
-            except Exception as e:
-                logger.error(f"Failed to spawn sniffer: {e}")
-                print(
-                    json.dumps(
+                if sniffer_exit_event.is_set():
+                    exit_code = sniffer_process.poll()
+                    logger.warning(f"Sniffer process exited. Code: {exit_code}")
+                    _emit_control(
                         {
                             "type": "SNIFFER_ERROR",
-                            "code": "SPAWN_FAILED",
-                            "message": str(e),
+                            "code": "PERMISSION_DENIED",
+                            "message": f"Sniffer died (Code {exit_code}).",
                         }
-                    ),
-                    flush=True,
+                    )
+                elif not sniffer_ready_event.is_set():
+                    logger.error("Sniffer startup timed out.")
+                    _emit_control_bytes(_SNIFFER_TIMEOUT_EVENT)
+
+            except Exception as e:
+                logger.error(f"Failed to spawn sniffer: {e}")
+                _emit_control(
+                    {
+                        "type": "SNIFFER_ERROR",
+                        "code": "SPAWN_FAILED",
+                        "message": str(e),
+                    }
                 )
         from tpi_redes.services.discovery import DiscoveryService
 
@@ -262,10 +422,7 @@ def start_server(
 
         logger.info(f"Starting {protocol.upper()} server on port {port}...")
         logger.info(f"Saving files to: {save_dir}")
-        print(
-            json.dumps({"type": "SERVER_READY", "protocol": protocol, "port": port}),
-            flush=True,
-        )
+        _emit_control({"type": "SERVER_READY", "protocol": protocol, "port": port})
 
         if protocol == "tcp":
             from tpi_redes.transport.tcp_server import TCPServer
@@ -327,26 +484,23 @@ def send_file(
     Can also spawn a local sniffer to capture outgoing traffic.
     """
     if not files:
-        console.print("[bold red]Error:[/bold red] No files provided.")
+        _console().print("[bold red]Error:[/bold red] No files provided.")
         return
 
     import subprocess
-    import threading
-    from pathlib import Path
 
     file_paths = [Path(f) for f in files]
 
     sniffer_process = None
 
     try:
-        if sniff:
-            if shutil.which("pkexec") is None:
-                logger.error("pkexec command not found; sniffer disabled.")
-                _emit_sniffer_error(
-                    "MISSING_PKEXEC",
-                    "pkexec command not found on system.",
-                )
-                sniff = False
+        if sniff and shutil.which("pkexec") is None:
+            logger.error("pkexec command not found; sniffer disabled.")
+            _emit_sniffer_error(
+                "MISSING_PKEXEC",
+                "pkexec command not found on system.",
+            )
+            sniff = False
 
         if sniff:
             logger.info("Requesting root privileges for Sniffer...")
@@ -354,62 +508,63 @@ def send_file(
 
             try:
                 sniffer_process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=sys.stderr, text=True, bufsize=1
+                    cmd, stdout=subprocess.PIPE, stderr=sys.stderr
                 )
 
                 sniffer_ready_event = threading.Event()
+                sniffer_exit_event = threading.Event()
 
                 def forward_sniffer_output():
-                    if not sniffer_process or not sniffer_process.stdout:
-                        return
-                    for line in sniffer_process.stdout:
-                        if line.strip():
-                            sys.stderr.write(f"[SNIFFER_SUB] {line}")
-                            sys.stderr.flush()
-
-                        if "SNIFFER_READY" in line:
-                            sniffer_ready_event.set()
-                        print(line, end="", flush=True)
+                    try:
+                        if not sniffer_process or not sniffer_process.stdout:
+                            return
+                        _start_writer()
+                        # Sniffer output is ASCII JSON lines; forward the raw
+                        # bytes without a decode/re-encode round trip. The
+                        # readiness marker may straddle a chunk boundary, so
+                        # keep a marker-sized carry while waiting for it.
+                        fd = sniffer_process.stdout.fileno()
+                        buf = bytearray(_FORWARD_BUFFER_SIZE)
+                        view = memoryview(buf)
+                        carry = b""
+                        # Mirroring every chunk to stderr costs a write and
+                        # a flush syscall each; only do it when someone is
+                        # actually looking (debug mode or an attached TTY).
+                        mirror = debug_mode or sys.stderr.isatty()
+                        while (n := os.readv(fd, [view])) > 0:
+                            chunk = bytes(view[:n])
+                            if mirror and chunk.strip():
+                                sys.stderr.buffer.write(b"[SNIFFER_SUB] " + chunk)
+                                sys.stderr.buffer.flush()
+
+                            if not sniffer_ready_event.is_set():
+                                if b"SNIFFER_READY" in carry + chunk:
+                                    sniffer_ready_event.set()
+                                else:
+                                    carry = chunk[-12:]
+                            _forward_bytes(chunk)
+                    finally:
+                        sniffer_exit_event.set()
+                        sniffer_ready_event.set()
 
                 t = threading.Thread(target=forward_sniffer_output, daemon=True)
                 t.start()
-                import time
-
-                wait_start = time.time()
-                while not sniffer_ready_event.is_set():
-                    if time.time() - wait_start > 30:
-                        logger.error("Sniffer startup timed out.")
-                        break
-
-                    if sniffer_process.poll() is not None:
-                        logger.warning(
-                            "Sniffer authentication cancelled or process died."
-                        )
-                        print(
-                            json.dumps(
-                                {
-                                    "type": "SNIFFER_ERROR",
-                                    "code": "PERMISSION_DENIED",
-                                    "message": "Sniffer authentication cancelled.",
-                                }
-                            ),
-                            flush=True,
-                        )
-                        break
-
-                    time.sleep(0.1)
+                sniffer_ready_event.wait(timeout=30)
+
+                if sniffer_exit_event.is_set():
+                    logger.warning("Sniffer authentication cancelled or process died.")
+                    _emit_control_bytes(_SNIFFER_CANCELLED_EVENT)
+                elif not sniffer_ready_event.is_set():
+                    logger.error("Sniffer startup timed out.")
 
             except Exception as e:
                 logger.error(f"Failed to spawn sniffer: {e}")
-                print(
-                    json.dumps(
-                        {
-                            "type": "SNIFFER_ERROR",
-                            "code": "SPAWN_FAILED",
-                            "message": str(e),
-                        }
-                    ),
-                    flush=True,
+                _emit_control(
+                    {
+                        "type": "SNIFFER_ERROR",
+                        "code": "SPAWN_FAILED",
+                        "message": str(e),
+                    }
                 )
 
         if protocol == "tcp":
@@ -424,7 +579,7 @@ def send_file(
             client.send_files(file_paths, ip, port, delay, chunk_size)
 
     except KeyboardInterrupt:
-        console.print("\n[yellow]Transfer cancelled by user.[/yellow]")
+        _console().print("\n[yellow]Transfer cancelled by user.[/yellow]")
     except Exception as e:
         raise e
     finally:
@@ -433,7 +588,9 @@ def send_file(
 
 
 @cli.command()
-@click.option("--listen-port", default=DEFAULT_PROXY_PORT, help="Port to listen on (Proxy)")
+@click.option(
+    "--listen-port", default=DEFAULT_PROXY_PORT, help="Port to listen on (Proxy)"
+)
 @click.option("--target-ip", default=DEFAULT_HOST, help="Target Server IP")
 @click.option("--target-port", default=DEFAULT_SERVER_PORT, help="Target Server Port")
 @click.option(
@@ -464,8 +621,6 @@ def start_proxy(
     If --interface is specified, attempts to escalate privileges to support sniffing.
     """
     import subprocess
-    import sys
-    import threading
 
     sniffer_process = None
     discovery = None
@@ -484,16 +639,18 @@ def start_proxy(
         logger.info("Requesting root privileges for Sniffer...")
 
         try:
-            sniffer_process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, text=True, bufsize=1
-            )
+            sniffer_process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
 
             def forward_sniffer_output():
                 try:
                     if not sniffer_process or not sniffer_process.stdout:
                         return
-                    for line in sniffer_process.stdout:
-                        print(line, end="", flush=True)
+                    _start_writer()
+                    fd = sniffer_process.stdout.fileno()
+                    buf = bytearray(_FORWARD_BUFFER_SIZE)
+                    view = memoryview(buf)
+                    while (n := os.readv(fd, [view])) > 0:
+                        _forward_bytes(view[:n])
                 except Exception as e:
                     logger.error(f"Sniffer output forwarding failed: {e}")
 
@@ -505,14 +662,14 @@ def start_proxy(
     from tpi_redes.services.discovery import DiscoveryService
     from tpi_redes.services.proxy import ProxyServer
 
-    console.print(
+    _console().print(
         f"[bold red]Starting MITM Proxy ({protocol.upper()}) "
         f"on port {listen_port}...[/bold red]"
     )
-    console.print(f"Target: {target_ip}:{target_port}")
+    _console().print(f"Target: {target_ip}:{target_port}")
     if interface:
-        console.print(f"Interface: {interface} (Sniffer Attached)")
-    console.print(f"Corruption Rate: {corruption_rate}")
+        _console().print(f"Interface: {interface} (Sniffer Attached)")
+    _console().print(f"Corruption Rate: {corruption_rate}")
 
     proxy = ProxyServer(
         listen_port, target_ip, target_port, corruption_rate, interface, protocol
@@ -527,14 +684,15 @@ def start_proxy(
 
         proxy.start()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Stopping proxy...[/yellow]")
+        _console().print("\n[yellow]Stopping proxy...[/yellow]")
     except Exception as e:
-        console.print(f"\n[bold red]Fatal error starting proxy: {e}[/bold red]")
+        _console().print(f"\n[bold red]Fatal error starting proxy: {e}[/bold red]")
         import traceback
 
         traceback.print_exc()
         sys.exit(1)
     finally:
+        proxy.stop()
         if discovery:
             discovery.stop()
         if sniffer_process:
@@ -558,7 +716,7 @@ def scan_network():
     print(json.dumps(peers or []))
 
     if not peers:
-        console.print("[yellow]No peers found.[/yellow]")
+        _console().print("[yellow]No peers found.[/yellow]")
     else:
         from rich.table import Table
 
@@ -568,7 +726,7 @@ def scan_network():
         table.add_column("Port", style="magenta")
         for peer in peers:
             table.add_row(peer["hostname"], peer["ip"], str(peer["port"]))
-        console.print(table)
+        _console().print(table)
 
 
 @cli.command()
@@ -33,28 +33,36 @@ class ProtocolHandler:
     """
 
     HEADER_FORMAT: ClassVar[str] = "!cHQH3s"
-    HEADER_SIZE: ClassVar[int] = struct.calcsize(HEADER_FORMAT)
+    _HEADER_STRUCT: ClassVar[struct.Struct] = struct.Struct(HEADER_FORMAT)
+    HEADER_SIZE: ClassVar[int] = _HEADER_STRUCT.size
 
     @staticmethod
     def pack_header(
-        op_code: bytes, filename: str, file_size: int, file_hash: str
+        op_code: bytes,
+        filename: str | bytes,
+        file_size: int,
+        file_hash: str | bytes,
     ) -> bytes:
         """Pack metadata into a binary header.
 
         Args:
             op_code: Operation identifier (e.g., b'F').
-            filename: Name of the file being sent.
+            filename: Name of the file being sent. Callers that already
+                hold the UTF-8 bytes may pass them to skip re-encoding.
             file_size: Size of the file in bytes.
-            file_hash: Integrity hash of the file.
+            file_hash: Integrity hash of the file (str or UTF-8 bytes).
 
         Returns:
             bytes: The packed 16-byte header.
         """
-        name_bytes = filename.encode("utf-8")
-        hash_bytes = file_hash.encode("utf-8")
+        name_bytes = (
+            filename if isinstance(filename, bytes) else filename.encode("utf-8")
+        )
+        hash_bytes = (
+            file_hash if isinstance(file_hash, bytes) else file_hash.encode("utf-8")
+        )
 
-        return struct.pack(
-            ProtocolHandler.HEADER_FORMAT,
+        return ProtocolHandler._HEADER_STRUCT.pack(
             op_code,
             len(name_bytes),
             file_size,
@@ -73,16 +81,18 @@ class ProtocolHandler:
             Header: The parsed header object.
 
         Raises:
-            ValueError: If the data length matches the expected header size.
-            struct.error: If unpacking fails due to format mismatch.
+            ValueError: If the data length does not match the expected header size.
         """
-        if len(data) != ProtocolHandler.HEADER_SIZE:
+        # Struct.unpack already rejects any length != HEADER_SIZE, so the
+        # happy path pays no explicit length branch; the error path converts
+        # struct.error into the ValueError callers expect.
+        try:
+            unpacked = ProtocolHandler._HEADER_STRUCT.unpack(data)
+        except struct.error as e:
             raise ValueError(
                 f"Invalid header size: expected {ProtocolHandler.HEADER_SIZE}, "
                 f"got {len(data)}"
-            )
-
-        unpacked = struct.unpack(ProtocolHandler.HEADER_FORMAT, data)
+            ) from e
 
         return Header(
             op_code=unpacked[0],
@@ -1,11 +1,73 @@
-import json
+import functools
 import logging
+import os
+import sys
 import time
 from typing import Any, ClassVar
 
+import orjson
+
 logger = logging.getLogger("tpi-redes")
 
 
+def _stdout_fd() -> int:
+    """Return the raw stdout fd, falling back to 1 under redirection."""
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return 1
+
+
+# Raw stdout fd for flushes: os.write is one syscall with no
+# BufferedWriter lock to contend on when other threads also emit events.
+STDOUT_FD = _stdout_fd()
+
+# Linux-only clock id, looked up by name so other platforms resolve None.
+_COARSE_CLOCK: int | None = getattr(time, "CLOCK_REALTIME_COARSE", None)
+
+if _COARSE_CLOCK is None:
+    coarse_time = time.time
+else:
+    _coarse_clock: int = _COARSE_CLOCK
+
+    def coarse_time() -> float:
+        """Wall-clock time from the kernel's coarse clock.
+
+        Roughly 10x cheaper than time.time() per call; millisecond-ish
+        resolution, which is plenty for event timestamps.
+        """
+        return time.clock_gettime(_coarse_clock)
+
+
+# Copied as the starting point of every PACKET_CAPTURE event: dict.copy
+# duplicates the table in C and the (interned) keys keep their cached
+# hashes, which is cheaper than rebuilding an 11-key literal per packet.
+_EVENT_TMPL: dict[str, Any] = {
+    "type": "PACKET_CAPTURE",
+    "timestamp": 0.0,
+    "src": "",
+    "dst": "",
+    "protocol": "",
+    "length": 0,
+    "info": "",
+    "flags": "",
+    "seq": 0,
+    "ack": 0,
+    "window": 0,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _format_addr(ip: str, port: int) -> str:
+    """Join an IP and port into the "ip:port" form the frontend expects.
+
+    A transfer emits thousands of events for the same handful of
+    endpoints, so caching the joined string drops the two per-packet str
+    allocations without changing the emitted schema.
+    """
+    return f"{ip}:{port}"
+
+
 class PacketLogger:
     """Handles buffering and flushing of packet capture events to stdout.
 
@@ -48,19 +110,17 @@ class PacketLogger:
             ack: Acknowledgment number.
             window: Window size.
         """
-        packet_data = {
-            "type": "PACKET_CAPTURE",
-            "timestamp": time.time(),
-            "src": src,
-            "dst": dst,
-            "protocol": protocol,
-            "length": length,
-            "info": info,
-            "flags": flags,
-            "seq": seq,
-            "ack": ack,
-            "window": window,
-        }
+        packet_data = _EVENT_TMPL.copy()
+        packet_data["timestamp"] = coarse_time()
+        packet_data["src"] = src
+        packet_data["dst"] = dst
+        packet_data["protocol"] = protocol
+        packet_data["length"] = length
+        packet_data["info"] = info
+        packet_data["flags"] = flags
+        packet_data["seq"] = seq
+        packet_data["ack"] = ack
+        packet_data["window"] = window
         PacketLogger._buffer.append(packet_data)
         PacketLogger._check_flush()
 
@@ -77,7 +137,7 @@ class PacketLogger:
     @staticmethod
     def _check_flush():
         """Check if buffer conditions are met and trigger flush."""
-        now = time.time()
+        now = coarse_time()
         if (
             len(PacketLogger._buffer) >= PacketLogger.BUFFER_SIZE_LIMIT
             or (now - PacketLogger._last_flush_time) >= PacketLogger.FLUSH_INTERVAL
@@ -91,9 +151,9 @@ class PacketLogger:
             return
 
         try:
-            print(json.dumps(PacketLogger._buffer), flush=True)
+            os.write(STDOUT_FD, orjson.dumps(PacketLogger._buffer) + b"\n")
             PacketLogger._buffer.clear()
-            PacketLogger._last_flush_time = time.time()
+            PacketLogger._last_flush_time = coarse_time()
         except Exception as e:
             logger.error(f"Failed to flush packet log: {e}")
 
@@ -126,11 +186,9 @@ class PacketLogger:
             ack: Acknowledgment number.
             window: Window size.
         """
-        src = f"{src_ip}:{src_port}"
-        dst = f"{dst_ip}:{dst_port}"
         PacketLogger.log_packet(
-            src,
-            dst,
+            _format_addr(src_ip, src_port),
+            _format_addr(dst_ip, dst_port),
             protocol,
             info,
             length=size,
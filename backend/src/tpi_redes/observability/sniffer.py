@@ -2,14 +2,123 @@ import json
 import logging
 import os
 import sys
-import time
+import threading
+from collections import deque
 from typing import Any
 
-from scapy.layers.inet import IP, TCP, UDP
-from scapy.sendrecv import AsyncSniffer
+import orjson
+
+from tpi_redes.observability.packet_logger import STDOUT_FD, coarse_time
 
 logger = logging.getLogger("tpi-redes")
 
+# scapy's import graph takes hundreds of milliseconds to load, so the
+# names are resolved lazily on first use: permission-denied early exits
+# and CLI runs that never sniff skip the cost entirely.
+_IPLayer: Any = None
+AsyncSniffer: Any = None
+
+
+def _import_scapy():
+    """Populate the module-level scapy names on first use."""
+    global _IPLayer, AsyncSniffer
+    if _IPLayer is None:
+        from scapy.layers.inet import IP
+
+        _IPLayer = IP
+    if AsyncSniffer is None:
+        from scapy.sendrecv import AsyncSniffer as _AsyncSniffer
+
+        AsyncSniffer = _AsyncSniffer
+
+
+# Receive-buffer size requested for the capture socket. Scapy applies
+# conf.bufsize as SO_RCVBUF when it opens the Linux capture socket; a
+# large buffer absorbs traffic bursts that would otherwise be dropped
+# before the Python callback can drain them. The kernel caps the
+# effective size at /proc/sys/net/core/rmem_max.
+_CAPTURE_BUFFER_SIZE = 32 * 1024 * 1024
+
+# Fixed-schema template for PACKET_CAPTURE lines. Interpolating prebuilt
+# bytes avoids constructing and traversing a 10-key dict per packet; the
+# fallback below keeps orjson for the rare string that needs escaping.
+_PACKET_TMPL = (
+    b'{"type":"PACKET_CAPTURE","timestamp":%.6f,"src":"%s","dst":"%s",'
+    b'"protocol":"%s","length":%d,"info":"%s","flags":"%s","seq":%d,'
+    b'"ack":%d,"window":%d}\n'
+)
+
+
+def _json_safe(value: str) -> bytes | None:
+    """Return `value` as bytes if it can be inlined into JSON unescaped.
+
+    Sniffer strings are IPs, flag letters and info lines built from them,
+    so this almost always succeeds; anything non-ASCII or containing a
+    quote or backslash falls back to a real encoder.
+    """
+    try:
+        encoded = value.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if b'"' in encoded or b"\\" in encoded:
+        return None
+    return encoded
+
+
+def _format_packet_line(
+    timestamp: float,
+    src: str,
+    dst: str,
+    protocol: str,
+    length: int,
+    info: str,
+    flags: str,
+    seq: int,
+    ack: int,
+    window: int,
+) -> bytes:
+    """Serialize one PACKET_CAPTURE event to a JSON line."""
+    src_b = _json_safe(src)
+    dst_b = _json_safe(dst)
+    info_b = _json_safe(info)
+    flags_b = _json_safe(flags)
+
+    if None not in (src_b, dst_b, info_b, flags_b):
+        try:
+            return _PACKET_TMPL % (
+                timestamp,
+                src_b,
+                dst_b,
+                protocol.encode("ascii"),
+                length,
+                info_b,
+                flags_b,
+                seq,
+                ack,
+                window,
+            )
+        except TypeError:
+            pass  # e.g. a None field on a hand-built packet
+
+    return (
+        orjson.dumps(
+            {
+                "type": "PACKET_CAPTURE",
+                "timestamp": timestamp,
+                "src": src,
+                "dst": dst,
+                "protocol": protocol,
+                "length": length,
+                "info": info,
+                "flags": flags,
+                "seq": seq,
+                "ack": ack,
+                "window": window,
+            }
+        )
+        + b"\n"
+    )
+
 
 class PacketSniffer:
     """Captures and analyzes network packets using Scapy.
@@ -19,19 +128,39 @@ class PacketSniffer:
     2. Stdout mode (via `start_stdout_mode`): Dedicated process outputting JSON.
 
     Requires root privileges (sudo) to capture packets on Linux interfaces.
+
+    Attributes:
+        EMIT_BUFFER_LIMIT (int): Maximum buffered event lines before a flush.
+        EMIT_FLUSH_INTERVAL (float): Maximum seconds to hold buffered lines.
     """
 
-    def __init__(self, interface: str | None, port: int):
+    EMIT_BUFFER_LIMIT = 50
+    EMIT_FLUSH_INTERVAL = 0.05
+
+    def __init__(self, interface: str | None, port: int, keep_summaries: bool = False):
         """Initialize sniffer configuration.
 
         Args:
             interface: Bind interface (e.g., 'eth0'). None for default.
             port: Port to filter logic for (captures 'tcp port X or udp port X').
+            keep_summaries: Store human-readable packet summaries for
+                `get_packets()`. Off by default: `pkt.summary()` is one of
+                scapy's most expensive calls and the summaries are only
+                used for debugging.
         """
         self.interface = interface
         self.port = port
+        # The BPF expression only depends on the port; build it once so
+        # sniffer restarts reuse it.
+        self._filter_str = f"tcp port {port} or udp port {port}"
         self.sniffer: Any = None
-        self.packets: list[str] = []
+        self._keep_summaries = keep_summaries
+        self.packets: deque[str] = deque(maxlen=1000)
+        self._pending: list[bytes] = []
+        self._pending_lock = threading.Lock()
+        self._last_emit_flush = 0.0
+        self._flusher_stop = threading.Event()
+        self._flusher: threading.Thread | None = None
 
     def start(self):
         """Start the background sniffer loop.
@@ -53,10 +182,12 @@ class PacketSniffer:
             )
             return
 
-        filter_str = f"tcp port {self.port} or udp port {self.port}"
+        filter_str = self._filter_str
         iface_name = self.interface or "default"
         logger.info(f"Starting Sniffer on {iface_name} with filter '{filter_str}'...")
 
+        _import_scapy()
+        self._enlarge_capture_buffer()
         self.sniffer = AsyncSniffer(
             iface=self.interface,
             filter=filter_str,
@@ -65,6 +196,7 @@ class PacketSniffer:
         )
         try:
             self.sniffer.start()
+            self._start_idle_flusher()
             logger.info("Sniffer started successfully.")
         except Exception as e:
             logger.error(f"Failed to start sniffer: {e}")
@@ -104,15 +236,14 @@ class PacketSniffer:
             )
             sys.exit(1)
 
-        filter_str = f"tcp port {self.port} or udp port {self.port}"
+        filter_str = self._filter_str
 
         try:
-            from scapy.all import AsyncSniffer as ScapyAsyncSniffer
-
-            assert ScapyAsyncSniffer
+            _import_scapy()
         except ImportError:
             sys.exit(1)
 
+        self._enlarge_capture_buffer()
         self.sniffer = AsyncSniffer(
             iface=self.interface,
             filter=filter_str,
@@ -120,15 +251,41 @@ class PacketSniffer:
             store=False,
         )
         self.sniffer.start()
+        self._start_idle_flusher()
         print("SNIFFER_READY", flush=True)
 
+        # The parent stops this child with SIGTERM, whose default action
+        # would skip the finally block below and drop any buffered lines.
+        # Turning it into SystemExit runs the flush on the way out.
+        import signal
+
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+
         try:
             self.sniffer.join()
         except KeyboardInterrupt:
             self.sniffer.stop()
+        finally:
+            self._flusher_stop.set()
+            self._flush_pending()
+
+    def _enlarge_capture_buffer(self):
+        """Ask scapy for a large SO_RCVBUF on the capture socket.
+
+        Must run before the AsyncSniffer is constructed: scapy reads
+        conf.bufsize when it opens the socket.
+        """
+        try:
+            from scapy.config import conf
+
+            conf.bufsize = max(conf.bufsize, _CAPTURE_BUFFER_SIZE)
+        except Exception as e:
+            logger.debug(f"Could not enlarge capture buffer: {e}")
 
     def stop(self):
         """Stop packet capturing."""
+        self._flusher_stop.set()
+        self._flush_pending()
         if self.sniffer:
             try:
                 self.sniffer.stop()
@@ -142,10 +299,65 @@ class PacketSniffer:
     def get_packets(self) -> list[str]:
         """Return a list of string summaries of captured packets.
 
+        Only populated when the sniffer was built with `keep_summaries=True`;
+        bounded to the most recent 1000 packets.
+
         Returns:
             list[str]: Summary lines.
         """
-        return self.packets
+        return list(self.packets)
+
+    def _flush_pending(self):
+        """Write all buffered event lines to stdout in one syscall.
+
+        os.writev hands the batch to the kernel as a scatter-gather list,
+        skipping both the b"".join copy and the BufferedWriter; stdout is
+        a blocking pipe here, so a short writev only happens on signal
+        interruption and the joined remainder is retried.
+
+        Called from both the scapy callback thread and the idle flusher,
+        so the buffer is swapped out under a lock and written outside it.
+        """
+        with self._pending_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._last_emit_flush = coarse_time()
+
+        try:
+            if hasattr(os, "writev"):
+                written = os.writev(STDOUT_FD, pending)
+                total = sum(len(line) for line in pending)
+                if written < total:
+                    os.write(STDOUT_FD, b"".join(pending)[written:])
+            else:
+                sys.stdout.buffer.write(b"".join(pending))
+                sys.stdout.buffer.flush()
+        except BrokenPipeError:
+            sys.exit(0)
+
+    def _start_idle_flusher(self):
+        """Start the daemon thread that flushes buffered lines when idle.
+
+        The age check in `_process_packet` only runs when another packet
+        arrives, so the tail of a burst would otherwise sit buffered
+        until the next capture. This thread bounds that latency to the
+        flush interval regardless of traffic.
+        """
+        if self._flusher is not None:
+            return
+        self._flusher_stop.clear()
+        self._flusher = threading.Thread(
+            target=self._idle_flush_loop, name="sniffer-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _idle_flush_loop(self):
+        """Flush pending lines whenever they outlive the flush interval."""
+        interval = PacketSniffer.EMIT_FLUSH_INTERVAL
+        while not self._flusher_stop.wait(interval):
+            if self._pending and coarse_time() - self._last_emit_flush >= interval:
+                self._flush_pending()
 
     def _process_packet(self, pkt: Any):
         """Callback for each captured packet.
@@ -157,13 +369,20 @@ class PacketSniffer:
             pkt: Scapy packet object.
         """
         try:
-            summary = pkt.summary()
-            self.packets.append(summary)
+            if _IPLayer is None:
+                _import_scapy()
+
+            if self._keep_summaries:
+                self.packets.append(pkt.summary())
 
-            if pkt.haslayer(IP):
-                src = pkt[IP].src
-                dst = pkt[IP].dst
-                length = pkt[IP].len
+            # A single getlayer(IP) resolves the network layer; from there
+            # the transport layer is just ip.payload, selected by the IP
+            # protocol number instead of further layer walks.
+            ip = pkt.getlayer(_IPLayer)
+            if ip is not None:
+                src = ip.src
+                dst = ip.dst
+                length = ip.len
 
                 protocol = "IP"
                 info = ""
@@ -172,35 +391,46 @@ class PacketSniffer:
                 ack = 0
                 window = 0
 
-                if pkt.haslayer(TCP):
+                proto = ip.proto
+                if proto == 6:  # TCP
+                    tcp = ip.payload
                     protocol = "TCP"
-                    flags = str(pkt[TCP].flags)
-                    seq = pkt[TCP].seq
-                    ack = pkt[TCP].ack
-                    window = pkt[TCP].window
+                    flags = str(tcp.flags)
+                    seq = tcp.seq
+                    ack = tcp.ack
+                    window = tcp.window
                     info = f"{src} -> {dst} [{flags}] Seq={seq} Ack={ack} Win={window}"
-                elif pkt.haslayer(UDP):
+                elif proto == 17:  # UDP
+                    udp = ip.payload
                     protocol = "UDP"
-                    info = f"{src} -> {dst} Len={pkt[UDP].len}"
-
-                packet_data = {
-                    "type": "PACKET_CAPTURE",
-                    "timestamp": time.time(),
-                    "src": src,
-                    "dst": dst,
-                    "protocol": protocol,
-                    "length": length,
-                    "info": info,
-                    "flags": flags,
-                    "seq": seq,
-                    "ack": ack,
-                    "window": window,
-                }
-
-                try:
-                    print(json.dumps(packet_data), flush=True)
-                except BrokenPipeError:
-                    sys.exit(0)
+                    info = f"{src} -> {dst} Len={udp.len}"
+
+                # Buffer event lines and flush in batches (same strategy as
+                # PacketLogger) so a capture burst costs one write/flush pair
+                # instead of one syscall per packet. One clock read serves
+                # both the timestamp and the flush-age check.
+                now = coarse_time()
+                line = _format_packet_line(
+                    now,
+                    src,
+                    dst,
+                    protocol,
+                    length,
+                    info,
+                    flags,
+                    seq,
+                    ack,
+                    window,
+                )
+                with self._pending_lock:
+                    self._pending.append(line)
+                    should_flush = (
+                        len(self._pending) >= PacketSniffer.EMIT_BUFFER_LIMIT
+                        or (now - self._last_emit_flush)
+                        >= PacketSniffer.EMIT_FLUSH_INTERVAL
+                    )
+                if should_flush:
+                    self._flush_pending()
 
         except BrokenPipeError:
             sys.exit(0)
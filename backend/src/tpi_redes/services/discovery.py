@@ -1,11 +1,13 @@
 import contextlib
-import json
 import logging
+import selectors
 import socket
 import threading
 import time
 from typing import Any
 
+import orjson
+
 from tpi_redes.config import DEFAULT_SERVER_PORT, DISCOVERY_BUFFER_SIZE
 
 logger = logging.getLogger("tpi-redes")
@@ -30,6 +32,9 @@ class DiscoveryService:
         """
         self.hostname = hostname or socket.gethostname()
         self.running = False
+        # The PING payload only depends on the hostname; build it once
+        # instead of re-serializing it on every scan.
+        self._ping_bytes = orjson.dumps({"type": "PING", "hostname": self.hostname})
 
     def scan(self, timeout: int = 2) -> list[dict[str, Any]]:
         """Scan for peers on the local network.
@@ -43,43 +48,60 @@ class DiscoveryService:
             list[dict]: List of unique discovered peers with keys: hostname, ip, port.
         """
         discovered_peers: list[dict[str, Any]] = []
+        seen: set[tuple[str, int]] = set()
+
+        def _handle_pong(data: bytes, addr: tuple[str, int]):
+            # Cheap bytes check filters non-PONG noise on the port without
+            # paying for a JSON parse.
+            if b'"PONG"' not in data:
+                return
+            # orjson parses bytes directly; no intermediate str.
+            response: dict[str, Any] = orjson.loads(data)
+
+            if response.get("type") == "PONG":
+                ip = addr[0]
+                peer_port: int = response.get("port", DEFAULT_SERVER_PORT)
+                key = (ip, peer_port)
+                if key not in seen:
+                    seen.add(key)
+                    hostname = response.get("hostname")
+                    discovered_peers.append(
+                        {"hostname": hostname, "ip": ip, "port": peer_port}
+                    )
+                    logger.info(f"Discovered peer: {hostname or 'Unknown'} ({ip})")
 
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            s.settimeout(timeout)
+            s.setblocking(False)
 
-            message = json.dumps({"type": "PING", "hostname": self.hostname}).encode(
-                "utf-8"
-            )
             try:
-                s.sendto(message, (BROADCAST_IP, DISCOVERY_PORT))
+                s.sendto(self._ping_bytes, (BROADCAST_IP, DISCOVERY_PORT))
                 logger.info("Sent Discovery PING...")
 
-                start_time = time.time()
-                while time.time() - start_time < timeout:
-                    try:
-                        data, addr = s.recvfrom(DISCOVERY_BUFFER_SIZE)
-                        response: dict[str, Any] = json.loads(data.decode("utf-8"))
-
-                        if response.get("type") == "PONG":
-                            peer: dict[str, Any] = {
-                                "hostname": response.get("hostname"),
-                                "ip": addr[0],
-                                "port": response.get("port", DEFAULT_SERVER_PORT),
-                            }
-                            if not any(
-                                (p["ip"] == peer["ip"] and p["port"] == peer["port"])
-                                for p in discovered_peers
-                            ):
-                                discovered_peers.append(peer)
-                                hostname = peer.get("hostname", "Unknown")
-                                logger.info(
-                                    f"Discovered peer: {hostname} ({peer['ip']})"
-                                )
-                    except TimeoutError:
-                        break
-                    except Exception:
-                        continue
+                # Replies tend to arrive as a burst right after the PING;
+                # drain every queued datagram per selector wakeup instead of
+                # one blocking recvfrom per reply.
+                deadline = time.monotonic() + timeout
+                with selectors.DefaultSelector() as sel:
+                    sel.register(s, selectors.EVENT_READ)
+
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        if not sel.select(timeout=remaining):
+                            continue
+
+                        while True:
+                            try:
+                                data, addr = s.recvfrom(DISCOVERY_BUFFER_SIZE)
+                            except BlockingIOError:
+                                break
+
+                            try:
+                                _handle_pong(data, addr)
+                            except Exception:
+                                continue
 
             except Exception as e:
                 logger.error(f"Discovery scan error: {e}")
@@ -97,6 +119,27 @@ class DiscoveryService:
         """
         self.running = True
 
+        # Hostname and announced port are fixed for the lifetime of the
+        # listener, so the PONG reply can be serialized once up front.
+        pong_bytes = orjson.dumps(
+            {"type": "PONG", "hostname": self.hostname, "port": port}
+        )
+
+        def _handle_ping(s: socket.socket, data: bytes, addr: tuple[str, int]):
+            # Anything without a PING marker cannot be a discovery request;
+            # skip it before paying for a JSON parse.
+            if b'"PING"' not in data:
+                return
+            try:
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Foreign broadcast traffic on the port; ignore.
+                return
+
+            if message.get("type") == "PING":
+                logger.info(f"Received PING from {message.get('hostname')} ({addr[0]})")
+                s.sendto(pong_bytes, addr)
+
         def _listen_loop():
             with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
                 s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -104,29 +147,35 @@ class DiscoveryService:
                     s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
 
                 s.bind(("", DISCOVERY_PORT))
+                s.setblocking(False)
                 logger.info(f"Discovery Service listening on UDP {DISCOVERY_PORT}")
 
-                while self.running:
-                    try:
-                        data, addr = s.recvfrom(DISCOVERY_BUFFER_SIZE)
-                        message = json.loads(data.decode("utf-8"))
-
-                        if message.get("type") == "PING":
-                            logger.info(
-                                f"Received PING from {message.get('hostname')} "
-                                f"({addr[0]})"
-                            )
-
-                            response = {
-                                "type": "PONG",
-                                "hostname": self.hostname,
-                                "port": port,
-                            }
-                            s.sendto(json.dumps(response).encode("utf-8"), addr)
-
-                    except Exception as e:
-                        if self.running:
-                            logger.error(f"Discovery listen error: {e}")
+                # Non-blocking socket + selector instead of a blocking
+                # recvfrom: one wakeup drains a whole burst of PINGs, and
+                # stop() takes effect within one poll interval instead of
+                # hanging until the next datagram arrives.
+                with selectors.DefaultSelector() as sel:
+                    sel.register(s, selectors.EVENT_READ)
+
+                    while self.running:
+                        if not sel.select(timeout=0.5):
+                            continue
+
+                        while True:
+                            try:
+                                data, addr = s.recvfrom(DISCOVERY_BUFFER_SIZE)
+                            except BlockingIOError:
+                                break
+                            except Exception as e:
+                                if self.running:
+                                    logger.error(f"Discovery listen error: {e}")
+                                break
+
+                            try:
+                                _handle_ping(s, data, addr)
+                            except Exception as e:
+                                if self.running:
+                                    logger.error(f"Discovery listen error: {e}")
 
         threading.Thread(target=_listen_loop, daemon=True).start()
 
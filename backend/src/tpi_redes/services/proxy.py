@@ -1,13 +1,37 @@
 import logging
+import os
 import random
 import socket
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 
 from tpi_redes.config import CHUNK_SIZE, MAX_UDP_PACKET_SIZE
-from tpi_redes.observability.packet_logger import PacketLogger
+from tpi_redes.observability.packet_logger import PacketLogger, coarse_time
 
 logger = logging.getLogger("tpi-redes")
 
+# Socket buffer size requested for bridged TCP sockets; large enough to
+# keep a high-bandwidth-delay-product path full between forward loops.
+_TCP_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _tune_tcp(sock: socket.socket):
+    """Apply latency/throughput socket options to a bridged TCP socket.
+
+    Disables Nagle so small forwarded chunks leave immediately instead of
+    waiting behind delayed ACKs, and raises both socket buffers past the
+    kernel defaults. Best effort: any option the platform rejects is
+    skipped.
+    """
+    for level, opt, value in (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, _TCP_BUFFER_SIZE),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, _TCP_BUFFER_SIZE),
+    ):
+        with suppress(OSError):
+            sock.setsockopt(level, opt, value)
+
 
 class ProxyServer:
     """Man-In-The-Middle (MITM) Proxy Server.
@@ -25,6 +49,7 @@ class ProxyServer:
         corruption_rate: float,
         interface: str | None = None,
         protocol: str = "tcp",
+        busy_poll_us: int = 0,
     ):
         """Initialize the proxy configuration.
 
@@ -35,6 +60,10 @@ class ProxyServer:
             corruption_rate: Probability (0.0 to 1.0) of corrupting a packet chunk.
             interface: Network interface to bind/sniff on.
             protocol: Protocol to proxy ('tcp' or 'udp').
+            busy_poll_us: Microseconds of kernel busy-polling (SO_BUSY_POLL)
+                on the listen sockets before the recv path sleeps. Lowers
+                wakeup latency at the cost of CPU; 0 (default) keeps the
+                normal blocking behavior.
         """
         self.listen_port = listen_port
         self.target_ip = target_ip
@@ -42,11 +71,20 @@ class ProxyServer:
         self.corruption_rate = corruption_rate
         self.interface = interface
         self.protocol = protocol.lower()
+        self.busy_poll_us = busy_poll_us
         self.running = False
 
         self.udp_sessions: dict[tuple[str, int], socket.socket] = {}
         self.udp_sessions_lock = threading.Lock()
 
+        # Bounded worker pool for TCP flows: each bridged connection
+        # occupies two workers (one per direction), so the cap keeps the
+        # thread count from scaling unbounded with accepted connections.
+        self._pool = ThreadPoolExecutor(
+            max_workers=2 * (os.cpu_count() or 4),
+            thread_name_prefix="proxy-flow",
+        )
+
     def start(self):
         """Start the proxy server loops."""
         if self.protocol == "tcp":
@@ -56,11 +94,38 @@ class ProxyServer:
         else:
             logger.error(f"Unsupported protocol: {self.protocol}")
 
+    def stop(self):
+        """Stop the proxy loops and release the worker pool.
+
+        Queued flow tasks are cancelled and running workers are left to
+        exit on their own; without the explicit shutdown a clean exit
+        waits on the executor's atexit join for any worker still parked
+        in recv.
+        """
+        self.running = False
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _apply_busy_poll(self, sock: socket.socket):
+        """Enable kernel busy-polling on `sock` when configured.
+
+        Linux-only knob; silently skipped where the option is missing or
+        the process lacks the privilege to set it.
+        """
+        if self.busy_poll_us <= 0:
+            return
+        try:
+            so_busy_poll = getattr(socket, "SO_BUSY_POLL", 46)
+            sock.setsockopt(socket.SOL_SOCKET, so_busy_poll, self.busy_poll_us)
+            logger.info(f"Busy-polling enabled: {self.busy_poll_us} us")
+        except OSError as e:
+            logger.debug(f"SO_BUSY_POLL unavailable: {e}")
+
     def start_tcp(self):
         """Start TCP Proxy Listener."""
         self.running = True
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._apply_busy_poll(server_socket)
             server_socket.bind(("0.0.0.0", self.listen_port))
             server_socket.listen(5)
             logger.info(
@@ -75,9 +140,7 @@ class ProxyServer:
                 try:
                     client_socket, addr = server_socket.accept()
                     logger.info(f"Accepted TCP connection from {addr}")
-                    threading.Thread(
-                        target=self.handle_client_tcp, args=(client_socket,)
-                    ).start()
+                    self._pool.submit(self.handle_client_tcp, client_socket)
                 except Exception as e:
                     if self.running:
                         logger.error(f"Error accepting connection: {e}")
@@ -87,6 +150,7 @@ class ProxyServer:
         self.running = True
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server_socket:
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._apply_busy_poll(server_socket)
             server_socket.bind(("0.0.0.0", self.listen_port))
             logger.info(
                 f"MITM UDP Proxy listening on port {self.listen_port}, "
@@ -109,24 +173,21 @@ class ProxyServer:
         try:
             target_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             target_socket.connect((self.target_ip, self.target_port))
-
-            client_to_target = threading.Thread(
-                target=self.forward_tcp, args=(client_socket, target_socket, True)
-            )
-            target_to_client = threading.Thread(
-                target=self.forward_tcp, args=(target_socket, client_socket, False)
-            )
-
-            client_to_target.start()
-            target_to_client.start()
-
-            client_to_target.join()
-            target_to_client.join()
-
         except Exception as e:
             logger.error(f"Proxy connection error: {e}")
-        finally:
             client_socket.close()
+            return
+
+        _tune_tcp(client_socket)
+        _tune_tcp(target_socket)
+
+        # The reply direction runs on a second pool worker while this
+        # worker forwards client -> target inline; forward_tcp shuts
+        # down and closes both sockets when its direction ends, and the
+        # shutdown wakes the peer direction's blocked recv with EOF so
+        # its worker returns to the pool.
+        self._pool.submit(self.forward_tcp, target_socket, client_socket, False)
+        self.forward_tcp(client_socket, target_socket, True)
 
     def handle_client_udp(
         self, server_socket: socket.socket, data: bytes, addr: tuple[str, int]
@@ -134,25 +195,32 @@ class ProxyServer:
         """Handle incoming UDP packet from client."""
         client_key = addr
 
-        with self.udp_sessions_lock:
-            target_socket = self.udp_sessions.get(client_key)
-            if not target_socket:
-                try:
-                    target_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    # Bind to ephemeral
-                    target_socket.connect((self.target_ip, self.target_port))
-                    self.udp_sessions[client_key] = target_socket
-
-                    # Start listener for replies
-                    threading.Thread(
-                        target=self.forward_udp_reply,
-                        args=(server_socket, target_socket, addr),
-                        daemon=True,
-                    ).start()
-                    logger.info(f"New UDP session for {addr}")
-                except Exception as e:
-                    logger.error(f"Failed to create target UDP socket: {e}")
-                    return
+        # Dict reads are atomic under the GIL, so the common case — the
+        # session already exists — takes no lock and every datagram after
+        # the first skips the critical section entirely. The lock only
+        # guards session creation, with a re-check inside in case another
+        # datagram from the same client raced us here.
+        target_socket = self.udp_sessions.get(client_key)
+        if not target_socket:
+            with self.udp_sessions_lock:
+                target_socket = self.udp_sessions.get(client_key)
+                if not target_socket:
+                    try:
+                        target_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                        # Bind to ephemeral
+                        target_socket.connect((self.target_ip, self.target_port))
+                        self.udp_sessions[client_key] = target_socket
+
+                        # Start listener for replies
+                        threading.Thread(
+                            target=self.forward_udp_reply,
+                            args=(server_socket, target_socket, addr),
+                            daemon=True,
+                        ).start()
+                        logger.info(f"New UDP session for {addr}")
+                    except Exception as e:
+                        logger.error(f"Failed to create target UDP socket: {e}")
+                        return
 
         # Forward Client -> Target
         try:
@@ -166,8 +234,6 @@ class ProxyServer:
 
             target_socket.send(data)
 
-            from contextlib import suppress
-
             with suppress(Exception):
                 PacketLogger.emit_packet(
                     addr[0],
@@ -207,8 +273,6 @@ class ProxyServer:
 
                 server_socket.sendto(data, client_addr)
 
-                from contextlib import suppress
-
                 with suppress(Exception):
                     PacketLogger.emit_packet(
                         self.target_ip,
@@ -234,57 +298,112 @@ class ProxyServer:
     def forward_tcp(
         self, source: socket.socket, destination: socket.socket, corrupt: bool
     ):
-        """Forward data from source to destination socket."""
+        """Forward data from source to destination socket.
+
+        Receives into one preallocated per-flow buffer with recv_into and
+        sends memoryview slices of it, so the steady state allocates
+        nothing per chunk; corruption flips the bit in place instead of
+        copying the chunk twice. Peer addresses are resolved once per
+        flow and packet events are aggregated over a 50 ms window, so
+        the inner loop pays no getpeername syscalls and at most one
+        emit per window instead of one per chunk.
+        """
+        buf = bytearray(CHUNK_SIZE)
+        view = memoryview(buf)
+
+        try:
+            src_ip, src_port = source.getpeername()
+            dst_ip, dst_port = destination.getpeername()
+        except OSError:
+            src_ip = dst_ip = ""
+            src_port = dst_port = 0
+
+        last_pkt_log = 0.0
+        pkts_since = 0
+        bytes_since = 0
+        corrupted_since = 0
+
+        def _emit_window(current_time: float):
+            nonlocal last_pkt_log, pkts_since, bytes_since, corrupted_since
+            info_tag = " [CORRUPTED]" if corrupted_since else ""
+            with suppress(Exception):
+                PacketLogger.emit_packet(
+                    src_ip,
+                    src_port,
+                    dst_ip,
+                    dst_port,
+                    "TCP",
+                    f"MITM Forward{info_tag} {pkts_since} chunks ({bytes_since}B)",
+                    size=bytes_since,
+                    flags="PA",
+                    seq=0,
+                    ack=0,
+                )
+            last_pkt_log = current_time
+            pkts_since = 0
+            bytes_since = 0
+            corrupted_since = 0
+
+        # Both operands are flow constants, so the corruption decision is
+        # made once here instead of re-reading self.corruption_rate on
+        # every chunk.
+        corrupting = corrupt and self.corruption_rate > 0
+
         try:
             while self.running:
-                data = source.recv(CHUNK_SIZE)
-                if not data:
+                n = source.recv_into(buf)
+                if not n:
                     break
+                chunk = view[:n]
 
-                if corrupt and self.corruption_rate > 0:
-                    original_data = data
-                    data = self.corrupt_data(data)
-                    info_tag = " [CORRUPTED]" if data != original_data else ""
-                else:
-                    info_tag = ""
+                if corrupting and self._corrupt_inplace(chunk):
+                    corrupted_since += 1
 
-                destination.sendall(data)
+                destination.sendall(chunk)
 
-                try:
-                    src_ip, src_port = source.getpeername()
-                    dst_ip, dst_port = destination.getpeername()
-                    PacketLogger.emit_packet(
-                        src_ip,
-                        src_port,
-                        dst_ip,
-                        dst_port,
-                        "TCP",
-                        f"MITM Forward{info_tag} Len={len(data)}",
-                        size=len(data),
-                        flags="PA",
-                        seq=0,
-                        ack=0,
-                    )
-                except Exception:
-                    pass
+                pkts_since += 1
+                bytes_since += n
+                current_time = coarse_time()
+                if current_time - last_pkt_log >= 0.05:
+                    _emit_window(current_time)
+
+            if pkts_since:
+                _emit_window(coarse_time())
         except Exception:
             pass
         finally:
-            source.close()
-            destination.close()
-
-    def corrupt_data(self, data: bytes) -> bytes:
-        """Randomly flip a single bit in a random byte of the data payload."""
+            # close() alone does not wake a thread parked in recv_into on
+            # the same socket — the in-flight read pins the kernel socket
+            # and no FIN leaves the host. shutdown() does: the peer
+            # direction's recv returns EOF, its worker goes back to the
+            # pool, and the FIN reaches the other end.
+            for sock in (source, destination):
+                with suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+                sock.close()
+
+    def _corrupt_inplace(self, data: bytearray | memoryview) -> bool:
+        """Randomly flip a single bit in a random byte, mutating `data`.
+
+        Returns:
+            bool: True if a bit was flipped.
+        """
         if random.random() < self.corruption_rate:
-            mutable_data = bytearray(data)
-            idx = random.randint(0, len(mutable_data) - 1)
+            idx = random.randint(0, len(data) - 1)
             bit_idx = random.randint(0, 7)
-            original_byte = mutable_data[idx]
-            mutable_data[idx] ^= 1 << bit_idx
+            original_byte = data[idx]
+            data[idx] ^= 1 << bit_idx
 
             logger.warning(
                 f"MITM: Corrupted byte at index {idx} "
-                f"(0x{original_byte:02x} -> 0x{mutable_data[idx]:02x})"
+                f"(0x{original_byte:02x} -> 0x{data[idx]:02x})"
             )
+            return True
+        return False
+
+    def corrupt_data(self, data: bytes) -> bytes:
+        """Randomly flip a single bit in a random byte of the data payload."""
+        mutable_data = bytearray(data)
+        if self._corrupt_inplace(mutable_data):
             return bytes(mutable_data)
         return data
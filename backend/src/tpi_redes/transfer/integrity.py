@@ -8,11 +8,11 @@ class IntegrityVerifier:
 
     def calculate_hash(self) -> str:
         """Calculate SHA-256 hash of the file."""
-        sha256_hash = hashlib.sha256()
-        with open(self._file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        # file_digest runs the whole read/update loop in C with the GIL
+        # released, so hashing proceeds at hashlib speed with no Python
+        # iterations at all.
+        with open(self._file_path, "rb", buffering=0) as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
 
     def save_hash_file(self) -> Path:
         """Save the calculated hash to a .sha256 file."""
@@ -1,16 +1,27 @@
-import json
+import contextlib
 import logging
+import os
 import socket
+import sys
+import threading
 from pathlib import Path
 from typing import Any
 
-from tpi_redes.config import CHUNK_SIZE, PROGRESS_REPORT_INTERVAL_BYTES
+import orjson
+
+from tpi_redes.config import TCP_CHUNK_SIZE
 from tpi_redes.core.base import BaseServer
 from tpi_redes.core.protocol import ProtocolHandler
 
 logger = logging.getLogger("tpi-redes")
 
 
+def _emit(event: dict[str, Any]):
+    """Write one JSON event line to stdout for the frontend."""
+    sys.stdout.buffer.write(orjson.dumps(event) + b"\n")
+    sys.stdout.buffer.flush()
+
+
 class TCPServer(BaseServer):
     """TCP implementation of the file transfer server.
 
@@ -22,7 +33,8 @@ class TCPServer(BaseServer):
         """Start listening for TCP connections.
 
         This method blocks the calling thread until a `KeyboardInterrupt` occurs.
-        It accepts connections and processes them sequentially via `handle_client`.
+        Each accepted connection is served on its own thread via `handle_client`,
+        so one long transfer does not block other senders.
 
         Returns:
             None: No return value.
@@ -36,12 +48,20 @@ class TCPServer(BaseServer):
             try:
                 while True:
                     conn, addr = s.accept()
-                    with conn:
-                        logger.info(f"Connected by {addr}")
-                        self.handle_client(conn, addr)
+                    logger.info(f"Connected by {addr}")
+                    threading.Thread(
+                        target=self._serve_connection,
+                        args=(conn, addr),
+                        daemon=True,
+                    ).start()
             except KeyboardInterrupt:
                 logger.info("Server stopping...")
 
+    def _serve_connection(self, conn: Any, addr: Any):
+        """Own a client socket for its session and close it when done."""
+        with conn:
+            self.handle_client(conn, addr)
+
     def stop(self):
         """Placeholder for stop logic (handled via process termination)."""
         pass
@@ -75,16 +95,13 @@ class TCPServer(BaseServer):
                 logger.debug(f"Expected Hash: {file_hash}")
 
                 logger.info(f"Receiving '{filename}' ({header.file_size} bytes)...")
-                print(
-                    json.dumps(
-                        {
-                            "type": "TRANSFER_UPDATE",
-                            "status": "start",
-                            "filename": filename,
-                            "total": header.file_size,
-                        }
-                    ),
-                    flush=True,
+                _emit(
+                    {
+                        "type": "TRANSFER_UPDATE",
+                        "status": "start",
+                        "filename": filename,
+                        "total": header.file_size,
+                    }
                 )
 
                 save_path = Path(self.save_dir) / filename
@@ -92,9 +109,17 @@ class TCPServer(BaseServer):
 
                 received_bytes = 0
                 with open(save_path, "wb") as f:
+                    # Reserve the blocks up front so the filesystem can lay
+                    # the file out contiguously instead of growing it one
+                    # write at a time. Best effort: not every filesystem
+                    # supports it.
+                    if header.file_size and hasattr(os, "posix_fallocate"):
+                        with contextlib.suppress(OSError):
+                            os.posix_fallocate(f.fileno(), 0, header.file_size)
+
                     while received_bytes < header.file_size:
                         chunk_size = min(
-                            CHUNK_SIZE, header.file_size - received_bytes
+                            TCP_CHUNK_SIZE, header.file_size - received_bytes
                         )
                         chunk = self._recv_exact(conn, chunk_size)
                         if not chunk:
@@ -102,37 +127,30 @@ class TCPServer(BaseServer):
                         f.write(chunk)
                         received_bytes += len(chunk)
 
-                        if (
-                            received_bytes % PROGRESS_REPORT_INTERVAL_BYTES < CHUNK_SIZE
-                            or received_bytes == header.file_size
-                        ):
-                            print(
-                                json.dumps(
-                                    {
-                                        "type": "TRANSFER_UPDATE",
-                                        "status": "progress",
-                                        "filename": filename,
-                                        "current": received_bytes,
-                                        "total": header.file_size,
-                                    }
-                                ),
-                                flush=True,
-                            )
+                        # Chunks are larger than the old 100 KiB reporting
+                        # interval, so one event per chunk is already
+                        # throttled.
+                        _emit(
+                            {
+                                "type": "TRANSFER_UPDATE",
+                                "status": "progress",
+                                "filename": filename,
+                                "current": received_bytes,
+                                "total": header.file_size,
+                            }
+                        )
 
                 hash_path = Path(f"{save_path}.sha256")
                 with open(hash_path, "w") as f:
                     f.write(file_hash)
 
                 logger.info(f"File '{filename}' received successfully.")
-                print(
-                    json.dumps(
-                        {
-                            "type": "TRANSFER_UPDATE",
-                            "status": "complete",
-                            "filename": filename,
-                        }
-                    ),
-                    flush=True,
+                _emit(
+                    {
+                        "type": "TRANSFER_UPDATE",
+                        "status": "complete",
+                        "filename": filename,
+                    }
                 )
 
         except Exception as e:
@@ -148,10 +166,15 @@ class TCPServer(BaseServer):
         Returns:
             bytes: The received data, or empty bytes if EOF is reached.
         """
-        data = b""
-        while len(data) < n:
-            packet = conn.recv(n - len(data))
-            if not packet:
+        # recv_into fills one preallocated buffer in place; the old
+        # data += packet loop re-copied everything received so far on
+        # every iteration.
+        buf = bytearray(n)
+        view = memoryview(buf)
+        offset = 0
+        while offset < n:
+            received = conn.recv_into(view[offset:], n - offset)
+            if received == 0:
                 return b""
-            data += packet
-        return data
+            offset += received
+        return bytes(buf)
@@ -1,8 +1,11 @@
-import json
 import logging
 import socket
+import sys
 import time
 from pathlib import Path
+from typing import Any
+
+import orjson
 
 from tpi_redes.config import UDP_PAYLOAD_SIZE
 from tpi_redes.core.protocol import ProtocolHandler
@@ -11,6 +14,12 @@ from tpi_redes.transfer.integrity import IntegrityVerifier
 logger = logging.getLogger("tpi-redes")
 
 
+def _emit(event: dict[str, Any]):
+    """Write one JSON event line to stdout for the frontend."""
+    sys.stdout.buffer.write(orjson.dumps(event) + b"\n")
+    sys.stdout.buffer.flush()
+
+
 class UDPClient:
     """Client for sending files to a UDP server (Best Effort).
 
@@ -65,8 +74,11 @@ class UDPClient:
                 file_size = file_path.stat().st_size
                 filename = file_path.name
 
+                # Encode once; header packing and metadata reuse the bytes.
+                name_bytes = filename.encode("utf-8")
+                hash_bytes = file_hash.encode("utf-8")
                 header = ProtocolHandler.pack_header(
-                    b"F", filename, file_size, file_hash
+                    b"F", name_bytes, file_size, hash_bytes
                 )
 
                 logger.info(f"Processing {filename}...")
@@ -84,7 +96,7 @@ class UDPClient:
                 )
                 time.sleep(0.001)
 
-                metadata = filename.encode("utf-8") + file_hash.encode("utf-8")
+                metadata = name_bytes + hash_bytes
                 s.sendto(metadata, addr)
                 PacketLogger.emit_packet(
                     src_ip=local_ip,
@@ -98,22 +110,25 @@ class UDPClient:
                 )
                 time.sleep(0.001)
 
-                print(
-                    json.dumps(
-                        {
-                            "type": "TRANSFER_UPDATE",
-                            "status": "start",
-                            "filename": filename,
-                            "total": file_size,
-                        }
-                    ),
-                    flush=True,
+                _emit(
+                    {
+                        "type": "TRANSFER_UPDATE",
+                        "status": "start",
+                        "filename": filename,
+                        "total": file_size,
+                    }
                 )
 
                 sent_bytes = 0
                 start_transfer = time.time()
                 last_stats_time = start_transfer
 
+                # Per-datagram packet events drown the hot loop in string
+                # formatting; aggregate them on a 50 ms cadence instead.
+                last_pkt_log = 0.0
+                pkts_since = 0
+                bytes_since = 0
+
                 with open(file_path, "rb") as f:
                     while chunk := f.read(chunk_size):
                         s.sendto(chunk, addr)
@@ -122,41 +137,60 @@ class UDPClient:
                         if delay > 0:
                             time.sleep(delay)
 
-                        PacketLogger.emit_packet(
-                            src_ip=local_ip,
-                            src_port=local_port,
-                            dst_ip=ip,
-                            dst_port=port,
-                            protocol="UDP",
-                            flags="",
-                            size=len(chunk),
-                            info=f"Chunk ({len(chunk)}B) - {sent_bytes}/{file_size}",
-                        )
+                        pkts_since += 1
+                        bytes_since += len(chunk)
 
                         current_time = time.time()
-                        if current_time - last_stats_time >= 0.1:
-                            print(
-                                json.dumps(
-                                    {
-                                        "type": "TRANSFER_UPDATE",
-                                        "status": "progress",
-                                        "filename": filename,
-                                        "current": sent_bytes,
-                                        "total": file_size,
-                                    }
+                        if current_time - last_pkt_log >= 0.05:
+                            PacketLogger.emit_packet(
+                                src_ip=local_ip,
+                                src_port=local_port,
+                                dst_ip=ip,
+                                dst_port=port,
+                                protocol="UDP",
+                                flags="",
+                                size=bytes_since,
+                                info=(
+                                    f"{pkts_since} chunks ({bytes_since}B)"
+                                    f" - {sent_bytes}/{file_size}"
                                 ),
-                                flush=True,
+                            )
+                            last_pkt_log = current_time
+                            pkts_since = 0
+                            bytes_since = 0
+
+                        if current_time - last_stats_time >= 0.1:
+                            _emit(
+                                {
+                                    "type": "TRANSFER_UPDATE",
+                                    "status": "progress",
+                                    "filename": filename,
+                                    "current": sent_bytes,
+                                    "total": file_size,
+                                }
                             )
                             last_stats_time = current_time
 
+                if pkts_since:
+                    PacketLogger.emit_packet(
+                        src_ip=local_ip,
+                        src_port=local_port,
+                        dst_ip=ip,
+                        dst_port=port,
+                        protocol="UDP",
+                        flags="",
+                        size=bytes_since,
+                        info=(
+                            f"{pkts_since} chunks ({bytes_since}B)"
+                            f" - {sent_bytes}/{file_size}"
+                        ),
+                    )
+
                 logger.info(f"UDP Transfer finished for {filename}.")
-                print(
-                    json.dumps(
-                        {
-                            "type": "TRANSFER_UPDATE",
-                            "status": "complete",
-                            "filename": filename,
-                        }
-                    ),
-                    flush=True,
+                _emit(
+                    {
+                        "type": "TRANSFER_UPDATE",
+                        "status": "complete",
+                        "filename": filename,
+                    }
                 )
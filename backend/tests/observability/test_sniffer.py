@@ -45,7 +45,7 @@ class TestPacketSniffer:
         """
         from scapy.layers.inet import IP, TCP
 
-        sniffer = PacketSniffer(interface="lo", port=8080)
+        sniffer = PacketSniffer(interface="lo", port=8080, keep_summaries=True)
 
         pkt = IP(src="127.0.0.1", dst="127.0.0.1") / TCP(
             dport=8080, flags="S", seq=100, ack=0
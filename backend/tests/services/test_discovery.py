@@ -5,8 +5,9 @@ from tpi_redes.services.discovery import DiscoveryService
 
 
 class TestDiscoveryService:
+    @patch("tpi_redes.services.discovery.selectors.DefaultSelector")
     @patch("socket.socket")
-    def test_scan_finds_peers(self, mock_socket_cls):
+    def test_scan_finds_peers(self, mock_socket_cls, mock_selector_cls):
         """Test that scan discovers peers correctly.
 
         Verifies that PING is sent and PONG is received and parsed.
@@ -17,6 +18,15 @@ class TestDiscoveryService:
         mock_socket = MagicMock()
         mock_socket_cls.return_value.__enter__.return_value = mock_socket
 
+        # One readable wakeup delivering the PONG, then nothing until the
+        # scan deadline expires.
+        mock_selector = MagicMock()
+        mock_selector_cls.return_value.__enter__.return_value = mock_selector
+        wakeups = [[(MagicMock(), 1)]]
+        mock_selector.select.side_effect = lambda *_a, **_k: (
+            wakeups.pop() if wakeups else []
+        )
+
         mock_socket.recvfrom.side_effect = [
             (
                 json.dumps(
@@ -24,7 +34,7 @@ class TestDiscoveryService:
                 ).encode("utf-8"),
                 ("192.168.1.10", 37020),
             ),
-            TimeoutError,
+            BlockingIOError,
         ]
 
         service = DiscoveryService()
@@ -39,8 +49,9 @@ class TestDiscoveryService:
         sent_data = json.loads(args[0].decode("utf-8"))
         assert sent_data["type"] == "PING"
 
+    @patch("tpi_redes.services.discovery.selectors.DefaultSelector")
     @patch("socket.socket")
-    def test_scan_no_peers(self, mock_socket_cls):
+    def test_scan_no_peers(self, mock_socket_cls, mock_selector_cls):
         """Test scan with no peers.
 
         Verifies that an empty list is returned when timeout occurs immediately.
@@ -50,7 +61,10 @@ class TestDiscoveryService:
         """
         mock_socket = MagicMock()
         mock_socket_cls.return_value.__enter__.return_value = mock_socket
-        mock_socket.recvfrom.side_effect = TimeoutError
+
+        mock_selector = MagicMock()
+        mock_selector_cls.return_value.__enter__.return_value = mock_selector
+        mock_selector.select.return_value = []
 
         service = DiscoveryService()
         peers = service.scan(timeout=0.1)
@@ -39,12 +39,14 @@ class TestProxyServer:
         assert corrupted == data
 
     @patch("socket.socket")
-    @patch("threading.Thread")
-    def test_proxy_handle_client(self, mock_thread, mock_socket_cls):
+    def test_proxy_handle_client(self, mock_socket_cls):
         """Test proxy client handling.
 
+        Verifies that both forwarding directions are dispatched: the
+        reply direction to the worker pool and the client direction
+        inline.
+
         Args:
-            mock_thread: Mocked threading.Thread class.
             mock_socket_cls: Mocked socket.socket class.
 
         Returns:
@@ -57,9 +59,16 @@ class TestProxyServer:
 
         mock_socket_cls.return_value = mock_target_socket
 
-        proxy.handle_client_tcp(mock_client_socket)
-
-        mock_target_socket.connect.assert_called_with(("target", 8080))
-
-        assert mock_thread.call_count == 2
-        mock_thread.return_value.start.assert_called()
+        with (
+            patch.object(proxy, "_pool") as mock_pool,
+            patch.object(proxy, "forward_tcp") as mock_forward,
+        ):
+            proxy.handle_client_tcp(mock_client_socket)
+
+            mock_target_socket.connect.assert_called_with(("target", 8080))
+            mock_pool.submit.assert_called_once_with(
+                mock_forward, mock_target_socket, mock_client_socket, False
+            )
+            mock_forward.assert_called_once_with(
+                mock_client_socket, mock_target_socket, True
+            )
@@ -18,7 +18,8 @@ def mock_socket():
 @pytest.fixture
 def mock_file(tmp_path):
     f = tmp_path / "test_delay.txt"
-    f.write_text("A" * 8192)
+    # Two TCP_CHUNK_SIZE chunks, so the TCP client sleeps twice.
+    f.write_text("A" * (512 * 1024))
     return f
 
 
@@ -28,9 +28,9 @@ class TestTCPClient:
             def connect(self, addr: tuple[str, int]):
                 pass
 
-            def sendall(self, data: bytes):
+            def sendall(self, data):
                 nonlocal sent_data
-                sent_data += data
+                sent_data += bytes(data)
 
             def close(self):
                 pass
@@ -38,6 +38,12 @@ class TestTCPClient:
             def getsockname(self):
                 return ("127.0.0.1", 12345)
 
+            def setsockopt(self, *_args):
+                pass
+
+            def getsockopt(self, *_args) -> int:
+                return 256 * 1024
+
             def __enter__(self):
                 return self
 
@@ -28,12 +28,13 @@ class TestTCPServer:
                 self.data_stream = data_stream
                 self.closed = False
 
-            def recv(self, bufsize: int) -> bytes:
+            def recv_into(self, buf, nbytes: int) -> int:
                 if not self.data_stream:
-                    return b""
-                chunk = self.data_stream[:bufsize]
-                self.data_stream = self.data_stream[bufsize:]
-                return chunk
+                    return 0
+                chunk = self.data_stream[:nbytes]
+                self.data_stream = self.data_stream[len(chunk) :]
+                buf[: len(chunk)] = chunk
+                return len(chunk)
 
             def close(self):
                 self.closed = True
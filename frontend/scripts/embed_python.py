@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Build a self-contained Windows Python runtime for the backend.
+
+Windows counterpart of build-backend-linux.sh: downloads the CPython
+embeddable distribution, bootstraps pip + uv inside it, and installs the
+backend package so electron-builder can ship the result as a resource.
+
+Run from any directory on a Windows builder:
+
+    python scripts/embed_python.py
+"""
+
+import concurrent.futures
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import urllib.request
+import zipfile
+from pathlib import Path
+
+PYTHON_VERSION = "3.14.0"
+PYTHON_EMBED_URL = (
+    f"https://www.python.org/ftp/python/{PYTHON_VERSION}"
+    f"/python-{PYTHON_VERSION}-embed-amd64.zip"
+)
+# Optional pinned digest of the embed zip (hex, from python.org). When set,
+# the download (and any cached copy) is verified before use.
+PYTHON_EMBED_SHA256 = os.environ.get("TPI_REDES_EMBED_SHA256", "")
+UV_URL = (
+    "https://github.com/astral-sh/uv/releases/latest/download"
+    "/uv-x86_64-pc-windows-msvc.zip"
+)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+BUILD_DIR = BACKEND_DIR / "build"
+VENV_DIR = BUILD_DIR / "python-runtime"
+
+# Downloads are cached across runs, keyed by the SHA-256 of their URL.
+CACHE_DIR = Path(
+    os.environ.get("TPI_REDES_EMBED_CACHE", str(Path.home() / ".cache" / "tpi-redes"))
+)
+
+
+def log(msg: str):
+    print(f"[embed] {msg}", flush=True)
+
+
+def fetch_cached(url: str, sha256: str | None = None) -> bytes:
+    """Return the body of a URL, caching it across runs.
+
+    The cache key is the SHA-256 of the URL, so bumping PYTHON_VERSION (or
+    any URL change) naturally misses the cache. Repeat builds skip both
+    downloads entirely.
+
+    Args:
+        url: URL to fetch.
+        sha256: Optional pinned hex digest; a mismatch (truncated download,
+            tampered mirror, stale cache entry) aborts the build. Cached
+            bytes are re-verified too — hashing 10-25 MB is effectively
+            free next to the download it guards.
+    """
+    # Note on transport tuning: both artifacts are zip archives, already
+    # deflate-compressed, so Content-Encoding: gzip would not shrink them;
+    # and they come from different hosts, so there is no connection to
+    # reuse between the two fetches (urllib opens one connection each).
+    # The cross-run cache above is what actually eliminates repeat traffic.
+    cache_path = CACHE_DIR / hashlib.sha256(url.encode()).hexdigest()
+    if cache_path.exists():
+        log(f"Using cached copy of {url}")
+        data = cache_path.read_bytes()
+    else:
+        log(f"Downloading {url}...")
+        with urllib.request.urlopen(url) as response:
+            data = response.read()
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(data)
+
+    if sha256:
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != sha256:
+            cache_path.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"SHA-256 mismatch for {url}: expected {sha256}, got {digest}"
+            )
+
+    return data
+
+
+def download_and_extract_zip(url: str, dest_dir: Path, sha256: str | None = None):
+    """Stream a zip download directly into extraction.
+
+    The archive is never written to disk: the response body is held in
+    memory (both archives are 10-25 MB) and extracted member by member on
+    a thread pool. zlib decompression releases the GIL, so extraction
+    scales with the builder's cores.
+    """
+    data = fetch_cached(url, sha256)
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        names = zf.namelist()
+
+    def _extract_member(name: str):
+        # Each worker gets its own ZipFile view over the shared bytes to
+        # avoid serializing every read on one file handle.
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            zf.extract(name, dest_dir)
+
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        list(pool.map(_extract_member, names))
+
+
+def enable_site_packages(python_dir: Path):
+    """Uncomment `import site` in the embeddable ._pth file.
+
+    The embeddable distribution ships with site-packages disabled; pip and
+    anything it installs are invisible until this line is enabled.
+    """
+    pth_files = list(python_dir.glob("python*._pth"))
+    if not pth_files:
+        raise FileNotFoundError(f"No ._pth file found in {python_dir}")
+
+    pth_file = pth_files[0]
+    content = pth_file.read_bytes()
+    pth_file.write_bytes(content.replace(b"#import site", b"import site"))
+
+
+def main():
+    uv_dir = BUILD_DIR / "uv"
+
+    # Only the outputs of this script need to be fresh; wiping BUILD_DIR
+    # wholesale also threw away unrelated build artifacts.
+    for stale in (VENV_DIR, uv_dir):
+        if stale.exists():
+            shutil.rmtree(stale)
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Both downloads are pure I/O waits; overlap them instead of paying
+    # two full round trips back to back.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        embed_future = pool.submit(
+            download_and_extract_zip,
+            PYTHON_EMBED_URL,
+            VENV_DIR,
+            PYTHON_EMBED_SHA256 or None,
+        )
+        uv_future = pool.submit(download_and_extract_zip, UV_URL, uv_dir)
+        embed_future.result()
+        uv_future.result()
+
+    enable_site_packages(VENV_DIR)
+
+    python_exe = VENV_DIR / "python.exe"
+
+    # The standalone uv binary installs straight into the embedded runtime,
+    # so there is no need to bootstrap pip (or install uv through it) at all.
+    uv_exe = uv_dir / "uv.exe"
+
+    # uv parallelizes installs, but caps itself conservatively on CI
+    # runners; pin its concurrency to the builder's core count.
+    uv_env = os.environ.copy()
+    jobs = str(os.cpu_count() or 4)
+    uv_env.setdefault("UV_CONCURRENT_DOWNLOADS", jobs)
+    uv_env.setdefault("UV_CONCURRENT_INSTALLS", jobs)
+
+    log("Installing backend dependencies...")
+    subprocess.run(
+        [str(uv_exe), "pip", "install", "--python", str(python_exe), "."],
+        check=True,
+        env=uv_env,
+        cwd=BACKEND_DIR,
+    )
+
+    # Precompile installed packages so first launch on user machines does
+    # not pay the compile-and-write-pyc cost; -j 0 uses every core.
+    log("Precompiling bytecode...")
+    subprocess.run(
+        [
+            str(python_exe),
+            "-m",
+            "compileall",
+            "-q",
+            "-j",
+            "0",
+            str(VENV_DIR / "Lib" / "site-packages"),
+        ],
+        check=True,
+    )
+
+    # Console entry points expect python.exe next to them in Scripts/.
+    # Hardlink instead of copying the ~100 KB exe; same volume, so this is
+    # a metadata-only operation. Fall back to a copy where links are
+    # unsupported (e.g. FAT-formatted build drives).
+    scripts_dir = VENV_DIR / "Scripts"
+    scripts_dir.mkdir(exist_ok=True)
+    scripts_python = scripts_dir / "python.exe"
+    scripts_python.unlink(missing_ok=True)
+    try:
+        os.link(python_exe, scripts_python)
+    except OSError:
+        shutil.copy(python_exe, scripts_python)
+
+    log(f"OK -> {VENV_DIR}")
+
+
+if __name__ == "__main__":
+    if sys.platform != "win32":
+        print("This script only supports Windows.", file=sys.stderr)
+        sys.exit(1)
+    main()